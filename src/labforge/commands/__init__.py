@@ -0,0 +1,25 @@
+# Shared helpers for CLI subcommands. Heavy imports (rich, the controller and
+# everything it pulls in) are deferred until a command actually needs them.
+_console = None
+_controller = None
+
+
+def get_console():
+    """Return the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
+
+
+def get_controller():
+    """Return the shared LabController, importing it on first use."""
+    global _controller
+    if _controller is None:
+        from labforge.controller import LabController
+
+        _controller = LabController()
+    return _controller
+
@@ -0,0 +1,31 @@
+import click
+
+from labforge.commands import get_console, get_controller
+
+
+@click.command()
+@click.option("-t", "--template", required=True, help="Lab template name or path to YAML file")
+@click.option("-n", "--name", default=None, help="Custom lab name")
+@click.option("--siem", default=None, help="Attach log forwarding to a running SIEM lab (lab ID)")
+@click.option("--splunk", default=None, help="Deprecated alias for --siem")
+@click.option("--override", multiple=True, help="Override settings as KEY=VAL")
+def build(template, name, siem, splunk, override):
+    """Build and start a lab from a template."""
+    console = get_console()
+    overrides = {}
+    for o in override:
+        if "=" not in o:
+            console.print(f"[bold red]Invalid override format:[/bold red] {o} (expected KEY=VAL)")
+            raise SystemExit(1)
+        k, v = o.split("=", 1)
+        overrides[k] = v
+
+    if siem and splunk and siem != splunk:
+        console.print("[bold red]Error:[/bold red] --siem and --splunk refer to different labs")
+        raise SystemExit(1)
+
+    selected_siem = siem or splunk
+    if splunk and not siem:
+        console.print("[yellow]Warning:[/yellow] --splunk is deprecated; use --siem")
+
+    get_controller().build(template, name=name, overrides=overrides or None, siem_lab=selected_siem)
@@ -0,0 +1,12 @@
+import click
+
+from labforge.commands import get_controller
+
+
+@click.command()
+@click.argument("lab_id")
+@click.option("--volumes", is_flag=True, help="Also remove volumes")
+@click.option("--force", is_flag=True, help="Force cleanup even if already destroyed")
+def destroy(lab_id, volumes, force):
+    """Tear down a lab."""
+    get_controller().destroy(lab_id, volumes=volumes, force=force)
@@ -0,0 +1,10 @@
+import click
+
+from labforge.commands import get_controller
+
+
+@click.command()
+@click.argument("lab_id")
+def info(lab_id):
+    """Show detailed access info for a lab."""
+    get_controller().info(lab_id)
@@ -0,0 +1,64 @@
+import click
+
+from labforge.commands import get_console
+
+# Static scaffold; only the name varies. {name} must be a quoted YAML scalar.
+_SCAFFOLD_TEMPLATE = """\
+name: {name}
+description: "Custom lab - edit this description"
+version: "1.0"
+author: "labforge"
+
+settings:
+  lab_password: "labforge123!"
+
+network:
+  subnet: "auto"
+
+services:
+  - name: example-service
+    image: "ubuntu:latest"
+    hostname: example
+    ip_offset: 10
+    platform: linux
+    ports:
+      - "8080:80"
+    environment:
+      EXAMPLE_VAR: "value"
+    access:
+      - label: "Web UI"
+        url: "http://localhost:8080"
+
+volumes: {{}}
+"""
+
+
+@click.command()
+@click.argument("path")
+def init(path):
+    """Scaffold a custom lab YAML configuration."""
+    import json
+    import os
+    from pathlib import Path
+
+    console = get_console()
+    target = Path(path)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(target, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except FileExistsError:
+        console.print(f"[bold red]File already exists:[/bold red] {target}")
+        raise SystemExit(1)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            # A JSON string is a valid double-quoted YAML scalar; non-ASCII is
+            # escaped, as yaml.dump did
+            f.write(_SCAFFOLD_TEMPLATE.format(name=json.dumps(target.stem)))
+    except BaseException:
+        # Don't leave an empty file behind to block the next attempt
+        target.unlink(missing_ok=True)
+        raise
+
+    console.print(f"[bold green]Created lab config:[/bold green] {target}")
+    console.print(f"Edit the file, then run: [bold]labforge build -t {path}[/bold]")
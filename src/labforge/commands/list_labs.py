@@ -0,0 +1,9 @@
+import click
+
+from labforge.commands import get_controller
+
+
+@click.command("list")
+def list_labs():
+    """List all labs with status."""
+    get_controller().list_labs()
@@ -0,0 +1,12 @@
+import click
+
+from labforge.commands import get_controller
+
+
+@click.command()
+@click.argument("lab_id")
+@click.option("-f", "--follow", is_flag=True, help="Follow log output")
+@click.option("-s", "--service", default=None, help="Service name to filter logs")
+def logs(lab_id, follow, service):
+    """Stream logs from a lab."""
+    get_controller().logs(lab_id, follow=follow, service=service)
@@ -0,0 +1,12 @@
+import click
+
+from labforge.commands import get_controller
+
+
+@click.command()
+@click.argument("lab_id")
+@click.option("-s", "--service", required=True, help="Service to shell into")
+@click.option("-c", "--command", default="/bin/bash", help="Command to run (default: /bin/bash)")
+def shell(lab_id, service, command):
+    """Shell into a container in a lab."""
+    get_controller().shell(lab_id, service, command=command)
@@ -0,0 +1,10 @@
+import click
+
+from labforge.commands import get_controller
+
+
+@click.command()
+@click.argument("lab_id")
+def start(lab_id):
+    """Start a stopped lab."""
+    get_controller().start(lab_id)
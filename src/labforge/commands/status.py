@@ -0,0 +1,18 @@
+import click
+
+from labforge.commands import get_controller
+
+
+@click.command()
+@click.argument("lab_id", required=False)
+@click.option("--all", "all_labs", is_flag=True, help="Show container status for every running lab")
+def status(lab_id, all_labs):
+    """Show status of a specific lab, or of all running labs with --all."""
+    if all_labs and lab_id:
+        raise click.UsageError("Pass either LAB_ID or --all, not both.")
+    if all_labs:
+        get_controller().status_all()
+    elif lab_id:
+        get_controller().status(lab_id)
+    else:
+        raise click.UsageError("Missing argument 'LAB_ID' (or pass --all).")
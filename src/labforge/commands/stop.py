@@ -0,0 +1,10 @@
+import click
+
+from labforge.commands import get_controller
+
+
+@click.command()
+@click.argument("lab_id")
+def stop(lab_id):
+    """Stop a running lab without destroying it."""
+    get_controller().stop(lab_id)
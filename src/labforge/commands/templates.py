@@ -0,0 +1,27 @@
+import click
+
+from labforge.commands import get_console
+
+
+@click.command()
+def templates():
+    """List available lab templates."""
+    from rich.table import Table
+
+    from labforge.config import list_templates
+
+    console = get_console()
+    tmpl_list = list_templates()
+    if not tmpl_list:
+        console.print("No templates found.")
+        return
+
+    table = Table(title="Available Templates")
+    table.add_column("Name", style="cyan")
+    table.add_column("Description", style="green")
+    table.add_column("File", style="dim")
+
+    for t in tmpl_list:
+        table.add_row(t["name"], t["description"], t["file"])
+
+    console.print(table)
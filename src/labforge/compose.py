@@ -2,9 +2,54 @@ from pathlib import Path
 
 import yaml
 
+from labforge.fileio import YamlDumper
 from labforge.network import NetworkAllocator
 
 
+def _handle_platform(service: dict, platform: str, svc: dict) -> None:
+    if platform == "windows-docker":
+        service["devices"] = ["/dev/kvm"]
+        service["cap_add"] = ["NET_ADMIN"]
+        service["stop_grace_period"] = "120s"
+
+
+def _handle_resources(service: dict, res: dict, svc: dict) -> None:
+    limits = {}
+    if "memory" in res:
+        limits["memory"] = res["memory"]
+    if "cpus" in res:
+        limits["cpus"] = str(res["cpus"])
+    service["deploy"] = {"resources": {"limits": limits}}
+
+
+def _handle_cap_add(service: dict, cap_add: list, svc: dict) -> None:
+    # Windows containers get a fixed capability set from _handle_platform
+    if svc.get("platform") != "windows-docker":
+        service["cap_add"] = cap_add
+
+
+# Service keys copied verbatim into the compose definition
+_DIRECT_COPY = frozenset({
+    "hostname",
+    "ports",
+    "environment",
+    "volumes",
+    "healthcheck",
+    "depends_on",
+    "command",
+    "restart",
+    "privileged",
+    "network_mode",
+})
+
+# Service keys that need translation: key -> handler(service, value, svc)
+_SPECIAL = {
+    "platform": _handle_platform,
+    "resources": _handle_resources,
+    "cap_add": _handle_cap_add,
+}
+
+
 class ComposeGenerator:
     """Transforms a validated lab config into a docker-compose.yml dict."""
 
@@ -47,73 +92,38 @@ class ComposeGenerator:
         if volumes_config:
             compose["volumes"] = volumes_config
 
+        ips = NetworkAllocator.service_ips(
+            subnet, [svc for svc in config["services"] if "network_mode" not in svc]
+        )
         for svc in config["services"]:
-            service_def = self._build_service(svc, subnet, network_name)
+            service_def = self._build_service(svc, ips.get(svc["name"]), network_name)
             compose["services"][svc["name"]] = service_def
 
         return compose
 
-    def _build_service(self, svc: dict, subnet: str, network_name: str) -> dict:
-        """Build a single service definition for docker-compose."""
-        service = {}
-
-        service["image"] = svc["image"]
-        service["container_name"] = svc["name"]
-
-        if "hostname" in svc:
-            service["hostname"] = svc["hostname"]
+    def _build_service(self, svc: dict, ip: str | None, network_name: str) -> dict:
+        """Build a single service definition for docker-compose.
 
-        ip = NetworkAllocator.compute_ip(subnet, svc["ip_offset"])
-        networks = {network_name: {"ipv4_address": ip}}
-        for extra in svc.get("extra_networks", []):
-            networks[extra] = {}
-        service["networks"] = networks
-
-        if svc.get("platform") == "windows-docker":
-            service["devices"] = ["/dev/kvm"]
-            service["cap_add"] = ["NET_ADMIN"]
-            service["stop_grace_period"] = "120s"
-
-        if "resources" in svc:
-            res = svc["resources"]
-            deploy = {"resources": {"limits": {}}}
-            if "memory" in res:
-                deploy["resources"]["limits"]["memory"] = res["memory"]
-            if "cpus" in res:
-                deploy["resources"]["limits"]["cpus"] = str(res["cpus"])
-            service["deploy"] = deploy
-
-        if "ports" in svc:
-            service["ports"] = svc["ports"]
-
-        if "environment" in svc:
-            service["environment"] = svc["environment"]
-
-        if "volumes" in svc:
-            service["volumes"] = svc["volumes"]
-
-        if "healthcheck" in svc:
-            service["healthcheck"] = svc["healthcheck"]
-
-        if "depends_on" in svc:
-            service["depends_on"] = svc["depends_on"]
-
-        if "command" in svc:
-            service["command"] = svc["command"]
-
-        if "restart" in svc:
-            service["restart"] = svc["restart"]
-
-        if "privileged" in svc:
-            service["privileged"] = svc["privileged"]
+        ``ip`` is the precomputed address on the lab network (None when the
+        service uses network_mode).
+        """
+        service = {
+            "image": svc["image"],
+            "container_name": svc["name"],
+        }
 
-        if "cap_add" in svc and svc.get("platform") != "windows-docker":
-            service["cap_add"] = svc["cap_add"]
+        # network_mode and networks are mutually exclusive
+        if "network_mode" not in svc:
+            networks = {network_name: {"ipv4_address": ip}}
+            for extra in svc.get("extra_networks", []):
+                networks[extra] = {}
+            service["networks"] = networks
 
-        if "network_mode" in svc:
-            service["network_mode"] = svc["network_mode"]
-            # network_mode and networks are mutually exclusive
-            service.pop("networks", None)
+        for key, value in svc.items():
+            if key in _DIRECT_COPY:
+                service[key] = value
+            elif key in _SPECIAL:
+                _SPECIAL[key](service, value, svc)
 
         return service
 
@@ -122,5 +132,5 @@ class ComposeGenerator:
         output_dir.mkdir(parents=True, exist_ok=True)
         path = output_dir / "docker-compose.yml"
         with open(path, "w") as f:
-            yaml.dump(compose, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(compose, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
         return path
@@ -1,50 +1,113 @@
+import functools
+import json
 import os
 import re
 from pathlib import Path
 
 import yaml
 
+from labforge.fileio import YamlLoader, atomic_write
 
 LABS_DIR = Path(__file__).parent.parent.parent / "labs"
+# Relative to the home directory; resolved on use since Path.home() raises
+# RuntimeError when HOME is unset and the uid has no passwd entry.
+TEMPLATE_CACHE_FILE = Path(".labforge", "templates.cache.json")
+
+_VAR_RE = re.compile(r"\$\{(\w+)\}")
+_REQUIRED_SERVICE_FIELDS = frozenset({"name", "image", "ip_offset"})
 
 
 class ConfigError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=1)
+def _scan_labs_dir(mtime_ns: int) -> dict[str, Path]:
+    """Map template stem -> path for LABS_DIR. Keyed on the directory mtime."""
+    index = {}
+    with os.scandir(LABS_DIR) as it:
+        for entry in it:
+            stem, dot, ext = entry.name.rpartition(".")
+            if not dot or ext not in ("yml", "yaml") or not entry.is_file():
+                continue
+            # .yml wins over .yaml when both exist
+            if ext == "yml":
+                index[stem] = LABS_DIR / entry.name
+            else:
+                index.setdefault(stem, LABS_DIR / entry.name)
+    return index
+
+
+def _labs_index() -> dict[str, Path]:
+    try:
+        mtime_ns = os.stat(LABS_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return _scan_labs_dir(mtime_ns)
+
+
 def resolve_template(template: str) -> Path:
     """Resolve a template name or path to a YAML file path."""
-    path = Path(template)
-    if path.exists() and path.suffix in (".yml", ".yaml"):
-        return path.resolve()
+    # Only probe the filesystem for things that look like a path
+    if "/" in template or os.sep in template or template.endswith((".yml", ".yaml")):
+        path = Path(template)
+        if path.suffix in (".yml", ".yaml") and path.is_file():
+            return path.resolve()
 
     # Check built-in labs directory
-    for ext in (".yml", ".yaml"):
-        candidate = LABS_DIR / f"{template}{ext}"
-        if candidate.exists():
-            return candidate.resolve()
+    candidate = _labs_index().get(template)
+    if candidate is not None:
+        return candidate.resolve()
 
     raise ConfigError(
         f"Template '{template}' not found. Run 'labforge templates' to see available templates."
     )
 
 
-def load_config(path: Path) -> dict:
-    """Load and parse a lab YAML config file."""
-    with open(path) as f:
-        config = yaml.safe_load(f)
+@functools.lru_cache(maxsize=32)
+def _parse_config(path: str, mtime_ns: int) -> dict:
+    """Parse a config file. Cached per (path, mtime); callers must not mutate the result."""
+    # Read the whole file in one go and hand libyaml a contiguous bytes buffer;
+    # it detects the encoding itself, skipping the TextIOWrapper layer.
+    with open(path, "rb") as f:
+        data = f.read()
+    config = yaml.load(data, Loader=YamlLoader)
     if not isinstance(config, dict):
         raise ConfigError(f"Invalid config file: {path}")
     return config
 
 
+def _copy_tree(node):
+    """Copy nested dicts/lists without a memo, so YAML aliases become separate objects.
+
+    copy.deepcopy would keep ``*anchor`` references shared, and a mutation
+    through one service would then show up in every service using the anchor.
+    """
+    if isinstance(node, dict):
+        return {key: _copy_tree(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_copy_tree(value) for value in node]
+    return node
+
+
+def load_config(path: Path) -> dict:
+    """Load and parse a lab YAML config file."""
+    config = _parse_config(str(path), os.stat(path).st_mtime_ns)
+    # Callers mutate the config (overrides, injected services), so hand out a copy.
+    return _copy_tree(config)
+
+
 def validate_config(config: dict) -> None:
     """Validate required fields in a lab config."""
     if "name" not in config:
         raise ConfigError("Config missing required field: 'name'")
-    if "services" not in config or not config["services"]:
+    services = config.get("services")
+    if not services:
         raise ConfigError("Config must define at least one service")
-    for i, svc in enumerate(config["services"]):
+    for i, svc in enumerate(services):
+        # Fast path: one subset check per well-formed service
+        if isinstance(svc, dict) and _REQUIRED_SERVICE_FIELDS <= svc.keys():
+            continue
         if "name" not in svc:
             raise ConfigError(f"Service {i} missing required field: 'name'")
         if "image" not in svc:
@@ -53,45 +116,150 @@ def validate_config(config: dict) -> None:
             raise ConfigError(f"Service '{svc['name']}' missing required field: 'ip_offset'")
 
 
+def _needs_interp(obj) -> bool:
+    """Return True as soon as any string in obj contains a ${...} reference."""
+    if isinstance(obj, str):
+        return "${" in obj
+    if isinstance(obj, dict):
+        return any(_needs_interp(v) for v in obj.values())
+    if isinstance(obj, list):
+        return any(_needs_interp(item) for item in obj)
+    return False
+
+
 def interpolate_variables(config: dict) -> dict:
-    """Interpolate ${var} references using values from config['settings']."""
+    """Interpolate ${var} references using values from config['settings'].
+
+    Dicts and lists without any substitution are returned as-is instead of
+    being rebuilt, so the result may share structure with ``config``.
+    """
+    if not _needs_interp(config):
+        return config
+
     settings = config.get("settings", {})
     # Also allow environment variable overrides
     lookup = {**settings}
 
-    def _replace(obj):
-        if isinstance(obj, str):
-            def _sub(m):
-                key = m.group(1)
-                if key in lookup:
-                    return str(lookup[key])
-                env_val = os.environ.get(key)
-                if env_val is not None:
-                    return env_val
-                return m.group(0)  # leave unresolved
-            return re.sub(r"\$\{(\w+)\}", _sub, obj)
-        elif isinstance(obj, dict):
-            return {k: _replace(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [_replace(item) for item in obj]
+    def _expand(m, _lookup=lookup, _env=os.environ.get):
+        key = m.group(1)
+        if key in _lookup:
+            return str(_lookup[key])
+        env_val = _env(key)
+        if env_val is not None:
+            return env_val
+        return m.group(0)  # leave unresolved
+
+    # Builtins and the regex are bound as default arguments so the recursion
+    # uses fast local lookups instead of global/attribute loads.
+    def _replace(
+        obj,
+        _isinstance=isinstance,
+        _str=str,
+        _dict=dict,
+        _list=list,
+        _sub=_VAR_RE.sub,
+        _expand=_expand,
+    ):
+        if _isinstance(obj, _str):
+            if "${" not in obj:
+                return obj
+            return _sub(_expand, obj)
+        elif _isinstance(obj, _dict):
+            out = None
+            for k, v in obj.items():
+                new = _replace(v)
+                if new is not v:
+                    if out is None:
+                        out = _dict(obj)
+                    out[k] = new
+            return obj if out is None else out
+        elif _isinstance(obj, _list):
+            out = None
+            for i, item in enumerate(obj):
+                new = _replace(item)
+                if new is not item:
+                    if out is None:
+                        out = _list(obj)
+                    out[i] = new
+            return obj if out is None else out
         return obj
 
     return _replace(config)
 
 
+def _template_cache_path() -> Path | None:
+    try:
+        return Path.home() / TEMPLATE_CACHE_FILE
+    except RuntimeError:
+        return None
+
+
+def _read_template_cache() -> dict:
+    path = _template_cache_path()
+    if path is None:
+        return {}
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_template_cache(cache: dict) -> None:
+    """Atomically replace the template cache. Failures are ignored; the cache is optional."""
+    path = _template_cache_path()
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, json.dumps(cache))
+    except OSError:
+        pass
+
+
 def list_templates() -> list[dict]:
-    """List all available lab templates with name and description."""
+    """List all available lab templates with name and description.
+
+    Name/description are cached on disk keyed by (path, mtime, size), so only
+    new or modified templates are re-parsed.
+    """
     templates = []
-    if not LABS_DIR.exists():
+    paths = sorted(_labs_index().values(), key=lambda p: p.name)
+    if not paths:
         return templates
-    for path in sorted(LABS_DIR.glob("*.yml")):
+
+    cache = _read_template_cache()
+    fresh = {}
+    for path in paths:
+        key = str(path)
         try:
-            config = load_config(path)
-            templates.append({
+            st = os.stat(key)
+        except OSError:
+            continue
+        record = cache.get(key)
+        if not (
+            isinstance(record, dict)
+            and record.get("mtime") == st.st_mtime_ns
+            and record.get("size") == st.st_size
+        ):
+            try:
+                config = _parse_config(key, st.st_mtime_ns)
+            except Exception:
+                continue
+            record = {
+                "mtime": st.st_mtime_ns,
+                "size": st.st_size,
                 "name": config.get("name", path.stem),
                 "description": config.get("description", ""),
-                "file": path.name,
-            })
-        except Exception:
-            continue
+            }
+        fresh[key] = record
+        templates.append({
+            "name": record["name"],
+            "description": record["description"],
+            "file": path.name,
+        })
+
+    if fresh != cache:
+        _write_template_cache(fresh)
     return templates
@@ -1,3 +1,4 @@
+import os
 import subprocess
 from pathlib import Path
 
@@ -19,6 +20,15 @@ from labforge.network import NetworkAllocator, NetworkError
 console = Console()
 
 
+def _chain_commands(cmds: list[str]) -> str:
+    """Join shell commands into one script that stops at the first failure.
+
+    Each command sits on its own lines inside its subshell so a trailing
+    ``# comment`` cannot swallow the closing parenthesis.
+    """
+    return " && ".join(f"(\n{cmd}\n)" for cmd in cmds)
+
+
 class LabController:
     """Orchestrates lab lifecycle: build, destroy, start, stop, info."""
 
@@ -104,10 +114,11 @@ class LabController:
             # Generate docker-compose.yml
             generator = ComposeGenerator()
             compose = generator.generate(config, subnet, lab_id, external_networks=external_networks)
-            compose_path = generator.write(compose, state.lab_dir)
+            lab_dir = Path(state.lab_dir)
+            compose_path = generator.write(compose, lab_dir)
             console.print(f"[bold]Compose file:[/bold] {compose_path}")
 
-            self._write_fluent_bit_config_if_needed(config, state.lab_dir)
+            self._write_fluent_bit_config_if_needed(config, lab_dir)
 
             # Start with docker compose
             console.print("\n[bold yellow]Starting lab...[/bold yellow]\n")
@@ -144,7 +155,7 @@ class LabController:
 
         # Stop docker compose if running
         compose_file = state.compose_file
-        if compose_file.exists():
+        if os.path.lexists(compose_file):
             try:
                 docker = DockerManager(compose_file, f"labforge-{lab_id}")
                 docker.down(volumes=volumes)
@@ -210,6 +221,33 @@ class LabController:
             except DockerError:
                 console.print("[yellow]Could not retrieve container status[/yellow]")
 
+    def status_all(self) -> None:
+        """Show container status for every running lab, querying Docker concurrently."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        labs = [lab for lab in LabState.list_all() if lab.get("status") == "running"]
+        if not labs:
+            console.print("No running labs.")
+            return
+
+        def _ps(lab_id: str) -> str | None:
+            docker = DockerManager(LabState(lab_id).compose_file, f"labforge-{lab_id}")
+            try:
+                return docker.ps()
+            except DockerError:
+                return None
+
+        # docker compose ps is subprocess-bound, so threads overlap the calls
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(_ps, [lab["lab_id"] for lab in labs]))
+
+        for lab, ps_output in zip(labs, results):
+            console.print(f"[bold]Lab:[/bold] {lab['lab_id']} ({lab.get('template', '?')})")
+            if ps_output is None:
+                console.print("[yellow]Could not retrieve container status[/yellow]")
+            else:
+                console.print(ps_output)
+
     def info(self, lab_id: str) -> None:
         """Show detailed access info for a lab."""
         lab_id = LabState.resolve_id(lab_id)
@@ -274,25 +312,24 @@ class LabController:
         table.add_column("Ports")
         table.add_column("Access")
 
-        for svc in lab_data.get("services", []):
-            ip = NetworkAllocator.compute_ip(subnet, svc["ip_offset"])
+        services = lab_data.get("services", [])
+        ips = NetworkAllocator.service_ips(subnet, services)
+        for svc in services:
+            ip = ips[svc["name"]]
             ports = ", ".join(svc.get("ports", [])) or "-"
 
-            access_lines = []
-            for acc in svc.get("access", []):
-                line = f"{acc.get('label', '')}: {acc.get('url', '')}"
-                creds = acc.get("credentials", {})
-                if creds:
-                    line += f" ({creds.get('username', '')}:{creds.get('password', '')})"
-                access_lines.append(line)
-
-            access_str = "\n".join(access_lines) if access_lines else "-"
+            access_str = "\n".join(map(self._format_access, svc.get("access", []))) or "-"
             table.add_row(svc["name"], ip, ports, access_str)
 
         console.print(table)
 
     def _run_post_start(self, config: dict, docker: DockerManager) -> None:
-        """Run post_start commands defined in services."""
+        """Run post_start commands defined in services.
+
+        Each service's commands are chained into a single ``sh -c`` exec.
+        Services are handled in template order, so a post_start may rely on
+        those of earlier services having finished.
+        """
         for svc in config.get("services", []):
             # Wait for container to be healthy if healthcheck is defined
             if svc.get("healthcheck"):
@@ -300,13 +337,20 @@ class LabController:
             elif svc["name"] == "splunk":
                 # Special handling for Splunk which takes longer to initialize
                 self._wait_for_splunk_ready(docker)
-            
-            for cmd in svc.get("post_start", []):
-                console.print(f"[dim]Running post_start on {svc['name']}: {cmd}[/dim]")
-                try:
-                    docker.exec(svc["name"], ["sh", "-c", cmd])
-                except DockerError as e:
-                    console.print(f"[yellow]Warning: post_start failed on {svc['name']}:[/yellow] {e}")
+
+            cmds = svc.get("post_start", [])
+            if not cmds:
+                continue
+            console.print(f"[dim]Running post_start on {svc['name']}:[/dim]")
+            for cmd in cmds:
+                console.print(f"[dim]  {cmd}[/dim]")
+            try:
+                docker.exec(svc["name"], ["sh", "-c", _chain_commands(cmds)], interactive=False)
+            except DockerError as e:
+                console.print(
+                    f"[yellow]Warning: post_start failed on {svc['name']}; "
+                    f"commands after the failing one were skipped:[/yellow] {e}"
+                )
 
     def _wait_for_splunk_ready(self, docker: DockerManager, timeout: int = 600) -> None:
         """Wait for Splunk to be ready by checking if it responds to HTTP requests."""
@@ -381,6 +425,16 @@ class LabController:
         
         console.print(f"[yellow]Warning: Timeout waiting for {service_name} to become healthy[/yellow]")
 
+    @staticmethod
+    def _format_access(acc: dict) -> str:
+        creds = acc.get("credentials")
+        if creds:
+            return (
+                f"{acc.get('label', '')}: {acc.get('url', '')} "
+                f"({creds.get('username', '')}:{creds.get('password', '')})"
+            )
+        return f"{acc.get('label', '')}: {acc.get('url', '')}"
+
     @staticmethod
     def _has_service(config: dict, name: str) -> bool:
         return any(svc.get("name") == name for svc in config.get("services", []))
@@ -1,7 +1,13 @@
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+# Resolve the docker binary once instead of walking PATH for every subprocess.
+# Falls back to the bare name so a missing install still surfaces as
+# FileNotFoundError in _run.
+_DOCKER = shutil.which("docker") or "docker"
+
 
 class DockerError(Exception):
     pass
@@ -13,20 +19,36 @@ class DockerManager:
     def __init__(self, compose_file: Path, project_name: str):
         self.compose_file = compose_file
         self.project_name = project_name
+        self._compose_prefix = (
+            _DOCKER, "compose",
+            "-f", str(compose_file),
+            "-p", project_name,
+        )
 
-    def _base_cmd(self) -> list[str]:
-        return [
-            "docker", "compose",
-            "-f", str(self.compose_file),
-            "-p", self.project_name,
-        ]
+    def _run(
+        self,
+        args: list[str],
+        capture: bool = True,
+        check: bool = True,
+        capture_stderr: bool = True,
+    ) -> subprocess.CompletedProcess:
+        """Run a compose command.
 
-    def _run(self, args: list[str], capture: bool = True, check: bool = True) -> subprocess.CompletedProcess:
-        cmd = self._base_cmd() + args
+        With ``capture=False`` output streams straight to the terminal and no
+        pipes are created. ``capture_stderr=False`` discards stderr instead of
+        piping it when only stdout is wanted.
+        """
+        cmd = [*self._compose_prefix, *args]
+        if capture:
+            stdout = subprocess.PIPE
+            stderr = subprocess.PIPE if capture_stderr else subprocess.DEVNULL
+        else:
+            stdout = stderr = None
         try:
             return subprocess.run(
                 cmd,
-                capture_output=capture,
+                stdout=stdout,
+                stderr=stderr,
                 text=True,
                 check=check,
             )
@@ -65,7 +87,7 @@ class DockerManager:
 
     def ps(self) -> str:
         """List containers and their status."""
-        result = self._run(["ps", "--format", "table"], capture=True)
+        result = self._run(["ps", "--format", "table"], capture=True, capture_stderr=False)
         return result.stdout
 
     def logs(self, follow: bool = False, service: str | None = None, tail: int | None = None) -> None:
@@ -78,7 +100,7 @@ class DockerManager:
         if service:
             args.append(service)
         # Stream directly to terminal
-        cmd = self._base_cmd() + args
+        cmd = [*self._compose_prefix, *args]
         try:
             subprocess.run(cmd, check=True)
         except subprocess.CalledProcessError as e:
@@ -86,14 +108,18 @@ class DockerManager:
         except KeyboardInterrupt:
             pass
 
-    def exec(self, service: str, command: str | list[str] = "/bin/bash") -> None:
-        """Exec into a running container."""
-        args = ["exec", "-it", service]
+    def exec(self, service: str, command: str | list[str] = "/bin/bash", interactive: bool = True) -> None:
+        """Exec into a running container.
+
+        Non-interactive execs (post_start commands) run without a TTY
+        (``-T``) so they work when labforge itself has no terminal attached.
+        """
+        args = ["exec", "-it" if interactive else "-T", service]
         if isinstance(command, str):
             args.append(command)
         else:
             args.extend(command)
-        cmd = self._base_cmd() + args
+        cmd = [*self._compose_prefix, *args]
         try:
             subprocess.run(cmd, check=True)
         except subprocess.CalledProcessError as e:
@@ -0,0 +1,34 @@
+import os
+
+try:
+    from yaml import CSafeDumper as YamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as YamlDumper
+    from yaml import SafeLoader as YamlLoader
+
+
+def atomic_write(path: str | os.PathLike, text: str) -> os.stat_result:
+    """Write ``text`` to a temp file beside ``path`` and rename it into place.
+
+    Readers see either the old file or the new one, never a partial write.
+    Returns the stat of the written file. On failure the temp file is removed
+    and the error is re-raised.
+    """
+    path = os.fspath(path)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            f.write(text)
+            f.flush()
+            # Taken before the rename so it describes this content even if
+            # another process replaces the file right after
+            st = os.fstat(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return st
@@ -1,56 +1,338 @@
-import hashlib
-import time
+import bisect
+import functools
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
 import yaml
 
+from labforge.fileio import YamlLoader, atomic_write
 
-DATA_DIR = Path(__file__).parent.parent.parent / "data"
+# Plain strings rather than Path objects: these are joined and stat'ed on every
+# listing, and os.path avoids Path construction overhead.
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "data"))
+
+# State is written as JSON; state.yml is still read for labs created before.
+STATE_FILE = "state.json"
+LEGACY_STATE_FILE = "state.yml"
+# Summary of every lab ({lab_id: {"stamp": ..., "summary": {status, ...}}}) kept
+# next to the lab dirs so listings read one small file instead of every state
+# file. The stamp is the state file's (name, mtime_ns, size) at indexing time.
+INDEX_FILE = "index.json"
 
 
 class StateError(Exception):
     pass
 
 
+def _stat_state_file(lab_dir: str) -> tuple[str, os.stat_result] | None:
+    """Return the path and stat of a lab's state file, preferring JSON over legacy YAML."""
+    for name in (STATE_FILE, LEGACY_STATE_FILE):
+        path = os.path.join(lab_dir, name)
+        try:
+            return path, os.stat(path)
+        except OSError:
+            continue
+    return None
+
+
+# Sorted lab directory names, memoised on DATA_DIR's mtime. LabState.create()
+# and delete() reset it so in-process changes are never missed on filesystems
+# with coarse timestamps.
+_DIR_CACHE = {"mtime": -1, "entries": []}
+
+
+def _lab_dirs() -> list[str]:
+    try:
+        mtime_ns = os.stat(DATA_DIR).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    if mtime_ns != _DIR_CACHE["mtime"]:
+        with os.scandir(DATA_DIR) as it:
+            entries = sorted(entry.name for entry in it if entry.is_dir())
+        _DIR_CACHE["mtime"] = mtime_ns
+        _DIR_CACHE["entries"] = entries
+    return _DIR_CACHE["entries"]
+
+
+def _invalidate_lab_dirs() -> None:
+    _DIR_CACHE["mtime"] = -1
+
+
+def _read_state(path: str):
+    """Parse a state file into a fresh object the caller may modify."""
+    # Hand the parsers bytes: json and libyaml decode UTF-8 themselves, which
+    # skips the TextIOWrapper decode pass.
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".json"):
+        return json.loads(data)
+    return yaml.load(data, Loader=YamlLoader)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_state(path: str, mtime_ns: int, size: int):
+    """Parse a state file. Cached per (path, mtime, size); callers must not mutate the result."""
+    return _read_state(path)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_state_header(path: str, mtime_ns: int, size: int):
+    """Parse only the top-level fields written before the ``services`` list."""
+    is_json = path.endswith(".json")
+    # _write emits JSON with indent=2, so top-level keys sit at two spaces
+    marker = b'\n  "services":' if is_json else b"\nservices:"
+    # Map the file and copy out only the prefix ahead of services; the list
+    # itself is never read into a Python object
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        length = os.fstat(fd).st_size
+        if length:
+            with mmap.mmap(fd, length, access=mmap.ACCESS_READ) as mm:
+                cut = mm.find(marker)
+                data = mm[:cut + 1] if cut != -1 else mm[:]
+        else:
+            # mmap cannot map an empty file
+            cut, data = -1, b""
+    finally:
+        os.close(fd)
+    if not is_json:
+        return yaml.load(data, Loader=YamlLoader)
+    if cut != -1:
+        # Close the object that was cut off ahead of "services"
+        data = data.rstrip().rstrip(b",") + b"\n}"
+    return json.loads(data)
+
+
+# Fields needed by list_all/used_subnets; all are written ahead of services
+_LIST_FIELDS = frozenset({"lab_id", "template", "status", "subnet", "created_at"})
+# Fields kept per lab in the index
+_INDEX_FIELDS = ("lab_id", "template", "name", "status", "subnet", "created_at", "updated_at")
+
+
+def _load_state_file(state_file: str, required: frozenset[str] | None = None) -> dict | None:
+    """Parse a state file, returning None if it is missing or malformed.
+
+    With ``required``, only the header is parsed; the full file is parsed
+    instead if the header does not contain all of those keys (older files).
+    """
+    try:
+        st = os.stat(state_file)
+        stamp = (state_file, st.st_mtime_ns, st.st_size)
+    except OSError:
+        return None
+    if required:
+        try:
+            header = _parse_state_header(*stamp)
+        except (OSError, ValueError, yaml.YAMLError):
+            header = None
+        if isinstance(header, dict) and required <= header.keys():
+            return header
+    try:
+        state = _parse_state(*stamp)
+    except (OSError, ValueError, yaml.YAMLError):
+        # json/yaml errors from files written by hand or by older versions
+        return None
+    if state and isinstance(state, dict):
+        return state
+    return None
+
+
+# Below this many labs a thread pool costs more than it saves
+_PARALLEL_THRESHOLD = 8
+
+
+def _load_states(paths: list[str], required: frozenset[str]) -> list[dict | None]:
+    """Load the state (header) of each path; None where it cannot be parsed."""
+    load = functools.partial(_load_state_file, required=required)
+    if len(paths) > _PARALLEL_THRESHOLD:
+        # File reads and libyaml parsing release the GIL, so threads overlap them
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+            return list(executor.map(load, paths))
+    return list(map(load, paths))
+
+
+def _state_stamp(path: str, st: os.stat_result) -> list:
+    # A list so it compares equal to the stamp read back from JSON
+    return [os.path.basename(path), st.st_mtime_ns, st.st_size]
+
+
+def _index_entry(state: dict, stamp: list) -> dict:
+    return {
+        "stamp": stamp,
+        "summary": {key: state[key] for key in _INDEX_FIELDS if key in state},
+    }
+
+
+def _read_index() -> dict:
+    try:
+        with open(os.path.join(DATA_DIR, INDEX_FILE)) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _write_index(index: dict) -> None:
+    """Atomically replace the index. Failures are ignored; _load_index repairs it."""
+    try:
+        atomic_write(
+            os.path.join(DATA_DIR, INDEX_FILE),
+            json.dumps(index, indent=2, sort_keys=True, default=str),
+        )
+    except OSError:
+        pass
+
+
+def _update_index(lab_id: str, entry: dict | None) -> None:
+    """Record (or with entry=None, drop) one lab's index entry."""
+    index = _read_index()
+    if entry is None:
+        if index.pop(lab_id, None) is None:
+            return
+    else:
+        index[lab_id] = entry
+    _write_index(index)
+
+
+def _load_index() -> dict[str, dict]:
+    """Return {lab_id: summary} for every lab, sorted by lab ID.
+
+    Each entry is checked against its lab's state file: entries whose
+    directory is gone are dropped, and labs that are missing from the index or
+    whose state file no longer matches the recorded stamp (older labs, edits,
+    or an index update lost to a concurrent write) are re-read and updated.
+    """
+    index = _read_index()
+    fresh = {}
+    stale = []
+    for lab_id in _lab_dirs():
+        found = _stat_state_file(os.path.join(DATA_DIR, lab_id))
+        if found is None:
+            continue
+        path, st = found
+        stamp = _state_stamp(path, st)
+        entry = index.get(lab_id)
+        if isinstance(entry, dict) and entry.get("stamp") == stamp and isinstance(entry.get("summary"), dict):
+            fresh[lab_id] = entry
+        else:
+            stale.append((lab_id, path, stamp))
+    states = _load_states([path for _, path, _ in stale], _LIST_FIELDS)
+    for (lab_id, _, stamp), state in zip(stale, states):
+        if state is not None:
+            fresh[lab_id] = _index_entry(state, stamp)
+    if fresh != index:
+        _write_index(fresh)
+    return {lab_id: fresh[lab_id]["summary"] for lab_id in sorted(fresh)}
+
+
+@functools.lru_cache(maxsize=1)
+def _used_subnets_indexed(mtime_ns: int) -> tuple[str, ...]:
+    """Collect subnets of non-destroyed labs. Keyed on DATA_DIR's mtime.
+
+    Adding or removing a lab bumps the directory mtime; status changes inside
+    a lab dir do not, so LabState clears this cache on every write.
+    """
+    return tuple(
+        state["subnet"]
+        for state in _load_index().values()
+        if state.get("status") not in ("destroyed",) and "subnet" in state
+    )
+
+
+def _emit_state(state: dict) -> str:
+    """Serialize a state dict as JSON with ``services`` always last.
+
+    Equivalent to ``json.dump(state, indent=2)`` for the header fields, which
+    stay one per line at two spaces so _parse_state_header can find the
+    services marker, but each service is emitted on a single line. json.dumps
+    without indent runs on the C encoder; with indent it falls back to the
+    pure-Python one.
+    """
+    dumps = json.dumps
+    lines = [
+        f"  {dumps(key)}: {dumps(value, default=str)}"
+        for key, value in state.items()
+        if key != "services"
+    ]
+    if "services" in state:
+        services = state["services"] or []
+        if services:
+            body = ",\n".join(f"    {dumps(svc, default=str)}" for svc in services)
+            lines.append(f'  "services": [\n{body}\n  ]')
+        else:
+            lines.append('  "services": []')
+    return "{\n" + ",\n".join(lines) + "\n}\n"
+
+
+@dataclass(slots=True)
+class Service:
+    """Per-service record kept in a lab's state."""
+
+    name: str
+    image: str
+    ip_offset: int
+    platform: str = "linux"
+    access: list | None = None
+    ports: list | None = None
+
+    @classmethod
+    def from_config(cls, svc: dict) -> "Service":
+        return cls(
+            svc["name"],
+            svc["image"],
+            svc["ip_offset"],
+            svc.get("platform", "linux"),
+            svc.get("access"),
+            svc.get("ports"),
+        )
+
+    def to_dict(self) -> dict:
+        """Return the state-file shape; unset access/ports are omitted."""
+        data = {
+            "name": self.name,
+            "image": self.image,
+            "ip_offset": self.ip_offset,
+            "platform": self.platform,
+        }
+        if self.access is not None:
+            data["access"] = self.access
+        if self.ports is not None:
+            data["ports"] = self.ports
+        return data
+
+
 def generate_lab_id(template_name: str) -> str:
     """Generate a short lab ID like 'mal-a1b2c3d4'."""
     prefix = template_name[:3]
-    hash_input = f"{template_name}-{time.time()}"
-    suffix = hashlib.sha256(hash_input.encode()).hexdigest()[:8]
+    suffix = os.urandom(4).hex()
     return f"{prefix}-{suffix}"
 
 
 class LabState:
-    """Manage lab state stored in data/<lab-id>/state.yml."""
+    """Manage lab state stored in data/<lab-id>/state.json."""
 
     def __init__(self, lab_id: str):
         self.lab_id = lab_id
-        self.lab_dir = DATA_DIR / lab_id
-        self.state_file = self.lab_dir / "state.yml"
+        self.lab_dir = os.path.join(DATA_DIR, lab_id)
+        self.state_file = os.path.join(self.lab_dir, STATE_FILE)
+        self.legacy_state_file = os.path.join(self.lab_dir, LEGACY_STATE_FILE)
 
     @property
     def compose_file(self) -> Path:
-        return self.lab_dir / "docker-compose.yml"
+        return Path(self.lab_dir, "docker-compose.yml")
 
     def create(self, template: str, config: dict, subnet: str) -> dict:
         """Create initial state for a new lab."""
-        self.lab_dir.mkdir(parents=True, exist_ok=True)
-
-        services = []
-        for svc in config.get("services", []):
-            svc_info = {
-                "name": svc["name"],
-                "image": svc["image"],
-                "ip_offset": svc["ip_offset"],
-                "platform": svc.get("platform", "linux"),
-            }
-            if "access" in svc:
-                svc_info["access"] = svc["access"]
-            if "ports" in svc:
-                svc_info["ports"] = svc["ports"]
-            services.append(svc_info)
+        os.makedirs(self.lab_dir, exist_ok=True)
+
+        services = [Service.from_config(svc) for svc in config.get("services", [])]
 
+        now = datetime.now(timezone.utc).isoformat()
         state = {
             "lab_id": self.lab_id,
             "template": template,
@@ -58,11 +340,13 @@ class LabState:
             "description": config.get("description", ""),
             "status": "building",
             "subnet": subnet,
-            "services": services,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": now,
+            "updated_at": now,
+            # Keep services last: listings only parse the fields above it
+            "services": [svc.to_dict() for svc in services],
         }
         self._write(state)
+        _invalidate_lab_dirs()
         return state
 
     def update_status(self, status: str) -> None:
@@ -74,51 +358,58 @@ class LabState:
 
     def load(self) -> dict:
         """Load state from disk."""
-        if not self.state_file.exists():
-            raise StateError(f"Lab '{self.lab_id}' not found")
-        with open(self.state_file) as f:
-            return yaml.safe_load(f)
+        # Parsed fresh each time: state.json is small, and json.loads is
+        # cheaper than deep-copying a cached dict for callers that modify it
+        for path in (self.state_file, self.legacy_state_file):
+            try:
+                return _read_state(path)
+            except FileNotFoundError:
+                continue
+        raise StateError(f"Lab '{self.lab_id}' not found")
 
     def delete(self) -> None:
         """Remove the lab directory and all its contents."""
         import shutil
-        if self.lab_dir.exists():
+        try:
             shutil.rmtree(self.lab_dir)
+        except FileNotFoundError:
+            pass
+        _update_index(self.lab_id, None)
+        _invalidate_lab_dirs()
+        _used_subnets_indexed.cache_clear()
 
     def _write(self, state: dict) -> None:
-        with open(self.state_file, "w") as f:
-            yaml.dump(state, f, default_flow_style=False, sort_keys=False)
+        # An interrupted write must never leave a truncated state.json behind
+        st = atomic_write(self.state_file, _emit_state(state))
+        # Drop a legacy state.yml so it cannot shadow or contradict the JSON
+        try:
+            os.unlink(self.legacy_state_file)
+        except FileNotFoundError:
+            pass
+        _update_index(self.lab_id, _index_entry(state, _state_stamp(self.state_file, st)))
+        _used_subnets_indexed.cache_clear()
 
     @staticmethod
     def list_all() -> list[dict]:
-        """List all labs with their state."""
-        labs = []
-        if not DATA_DIR.exists():
-            return labs
-        for lab_dir in sorted(DATA_DIR.iterdir()):
-            state_file = lab_dir / "state.yml"
-            if lab_dir.is_dir() and state_file.exists():
-                try:
-                    with open(state_file) as f:
-                        state = yaml.safe_load(f)
-                    if state and isinstance(state, dict):
-                        labs.append(state)
-                except Exception:
-                    continue
-        return labs
+        """List all labs with their summary fields (no services), sorted by lab ID.
+
+        Reads the index rather than each lab's state file.
+        """
+        return list(_load_index().values())
 
     @staticmethod
     def resolve_id(partial_id: str) -> str:
         """Resolve a partial lab ID to a full ID."""
-        if not DATA_DIR.exists():
+        ids = list(_load_index())
+        if not ids:
             raise StateError(f"No labs found")
 
+        # IDs sharing a prefix are contiguous in sorted order
+        i = bisect.bisect_left(ids, partial_id)
         matches = []
-        for lab_dir in DATA_DIR.iterdir():
-            if lab_dir.is_dir() and lab_dir.name.startswith(partial_id):
-                state_file = lab_dir / "state.yml"
-                if state_file.exists():
-                    matches.append(lab_dir.name)
+        while i < len(ids) and ids[i].startswith(partial_id):
+            matches.append(ids[i])
+            i += 1
 
         if len(matches) == 0:
             raise StateError(f"No lab found matching '{partial_id}'")
@@ -131,8 +422,8 @@ class LabState:
     @staticmethod
     def used_subnets() -> list[str]:
         """Return subnets in use by existing labs."""
-        subnets = []
-        for state in LabState.list_all():
-            if state.get("status") not in ("destroyed",) and "subnet" in state:
-                subnets.append(state["subnet"])
-        return subnets
+        try:
+            mtime_ns = os.stat(DATA_DIR).st_mtime_ns
+        except FileNotFoundError:
+            return []
+        return list(_used_subnets_indexed(mtime_ns))
@@ -1,49 +1,99 @@
+import functools
 import ipaddress
+import itertools
 
 
 BASE_NETWORK = ipaddress.IPv4Network("172.30.0.0/16")
 SUBNET_PREFIX = 24
 
+# Allocation bounds as ints. Candidates start one /24 in, which skips
+# 172.30.0.0/24 without a per-iteration check.
+_SUBNET_STEP = 1 << (32 - SUBNET_PREFIX)
+_BASE_INT = int(BASE_NETWORK.network_address)
+_FIRST_INT = _BASE_INT + _SUBNET_STEP
+_END_INT = _BASE_INT + BASE_NETWORK.num_addresses
+
 
 class NetworkError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_subnet(subnet: str) -> tuple[int, int]:
+    """Return (network address as int, number of addresses) for a subnet string."""
+    net = ipaddress.IPv4Network(subnet)
+    return int(net.network_address), net.num_addresses
+
+
+def _int_to_ip(addr: int) -> str:
+    return f"{addr >> 24 & 255}.{addr >> 16 & 255}.{addr >> 8 & 255}.{addr & 255}"
+
+
+class Subnet:
+    """A parsed subnet; addresses are computed by integer offset from the network address."""
+
+    def __init__(self, subnet: str):
+        self.subnet = subnet
+        self._network_int, self._size = _parse_subnet(subnet)
+
+    def compute_ip(self, offset: int) -> str:
+        """Compute an IP address from an offset into the subnet."""
+        if not 0 <= offset < self._size:
+            raise NetworkError(
+                f"IP offset {offset} is out of range for subnet {self.subnet}"
+            )
+        return _int_to_ip(self._network_int + offset)
+
+    def gateway_ip(self) -> str:
+        """Return the gateway IP (first usable address)."""
+        return _int_to_ip(self._network_int + 1)
+
+
 class NetworkAllocator:
     """Allocates unique /24 subnets from 172.30.0.0/16 for each lab."""
 
     def __init__(self, used_subnets: list[str] | None = None):
+        # Network addresses of used subnets as plain ints
         self.used = set()
         for s in (used_subnets or []):
             try:
-                self.used.add(ipaddress.IPv4Network(s))
+                self.used.add(int(ipaddress.IPv4Network(s).network_address))
             except ValueError:
                 pass
+        # Scanning resumes after the highest subnet handed out so far
+        self._cursor = max((a for a in self.used if _BASE_INT <= a < _END_INT), default=_BASE_INT)
 
     def allocate(self) -> str:
-        """Allocate the next available /24 subnet."""
-        for subnet in BASE_NETWORK.subnets(new_prefix=SUBNET_PREFIX):
-            # Skip the first subnet (172.30.0.0/24) to avoid conflicts
-            if subnet.network_address == BASE_NETWORK.network_address:
-                continue
-            if subnet not in self.used:
-                self.used.add(subnet)
-                return str(subnet)
+        """Allocate the next available /24 subnet.
+
+        Scans forward from the last allocated subnet and wraps around to the
+        start of the range, so allocation is O(1) amortised as labs accumulate.
+        """
+        start = self._cursor + _SUBNET_STEP
+        if not _FIRST_INT <= start < _END_INT:
+            start = _FIRST_INT
+        for addr in itertools.chain(
+            range(start, _END_INT, _SUBNET_STEP),
+            range(_FIRST_INT, start, _SUBNET_STEP),
+        ):
+            if addr not in self.used:
+                self.used.add(addr)
+                self._cursor = addr
+                return f"{_int_to_ip(addr)}/{SUBNET_PREFIX}"
         raise NetworkError("No available subnets in 172.30.0.0/16")
 
     @staticmethod
     def compute_ip(subnet: str, offset: int) -> str:
         """Compute an IP address from a subnet and offset."""
-        net = ipaddress.IPv4Network(subnet)
-        ip = net.network_address + offset
-        if ip not in net:
-            raise NetworkError(
-                f"IP offset {offset} is out of range for subnet {subnet}"
-            )
-        return str(ip)
+        return Subnet(subnet).compute_ip(offset)
+
+    @staticmethod
+    def service_ips(subnet: str, services: list[dict]) -> dict[str, str]:
+        """Compute {service name: IP} for services, parsing the subnet only once."""
+        net = Subnet(subnet)
+        return {svc["name"]: net.compute_ip(svc["ip_offset"]) for svc in services}
 
     @staticmethod
     def gateway_ip(subnet: str) -> str:
         """Return the gateway IP (first usable address) for a subnet."""
-        net = ipaddress.IPv4Network(subnet)
-        return str(net.network_address + 1)
+        return Subnet(subnet).gateway_ip()
@@ -0,0 +1,34 @@
+from labforge.config import interpolate_variables, load_config
+from labforge.controller import LabController
+
+TEMPLATE = """\
+name: range
+networks: &nets
+  - lab
+services:
+  - name: kali
+    image: kali:latest
+    ip_offset: 10
+    extra_networks: *nets
+  - name: victim
+    image: victim:latest
+    ip_offset: 11
+    extra_networks: *nets
+"""
+
+
+def test_load_config_does_not_share_yaml_aliases(tmp_path):
+    path = tmp_path / "range.yml"
+    path.write_text(TEMPLATE)
+
+    config = interpolate_variables(load_config(path))
+    kali, victim = config["services"]
+    assert kali["extra_networks"] is not victim["extra_networks"]
+
+    LabController._attach_service_to_networks(config, "kali", ["range-x"])
+    assert kali["extra_networks"] == ["lab", "range-x"]
+    assert victim["extra_networks"] == ["lab"]
+    assert config["networks"] == ["lab"]
+
+    # The parse cache is not affected by the mutation
+    assert load_config(path)["services"][0]["extra_networks"] == ["lab"]
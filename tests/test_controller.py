@@ -0,0 +1,25 @@
+import subprocess
+
+from labforge.controller import _chain_commands
+
+
+def _run(script):
+    return subprocess.run(["sh", "-c", script], capture_output=True, text=True)
+
+
+def test_chain_commands_runs_in_order():
+    result = _run(_chain_commands(["echo one", "echo two"]))
+    assert result.returncode == 0
+    assert result.stdout == "one\ntwo\n"
+
+
+def test_chain_commands_allows_trailing_comment():
+    result = _run(_chain_commands(["echo one # note", "echo two"]))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "one\ntwo\n"
+
+
+def test_chain_commands_stops_at_first_failure():
+    result = _run(_chain_commands(["echo one", "false", "echo three"]))
+    assert result.returncode != 0
+    assert result.stdout == "one\n"
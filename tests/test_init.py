@@ -0,0 +1,20 @@
+from click.testing import CliRunner
+
+from labforge.commands import init as init_module
+from labforge.config import load_config
+
+
+def test_init_escapes_non_ascii_name(tmp_path):
+    target = tmp_path / "日本.yml"
+    result = CliRunner().invoke(init_module.init, [str(target)])
+    assert result.exit_code == 0, result.output
+    assert target.read_bytes().isascii()
+    assert load_config(target)["name"] == "日本"
+
+
+def test_init_removes_file_when_write_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(init_module, "_SCAFFOLD_TEMPLATE", "name: {missing}\n")
+    target = tmp_path / "lab.yml"
+    result = CliRunner().invoke(init_module.init, [str(target)])
+    assert result.exit_code != 0
+    assert not target.exists()
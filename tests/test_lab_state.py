@@ -0,0 +1,127 @@
+import json
+import os
+import shutil
+
+import pytest
+import yaml
+
+from labforge import lab_state
+from labforge.lab_state import LabState
+
+CONFIG = {
+    "name": "Attack lab",
+    "description": "d",
+    "services": [
+        {"name": "kali", "image": "kali:latest", "ip_offset": 10, "ports": ["8080:80"]},
+        {"name": "target", "image": "target:latest", "ip_offset": 11},
+    ],
+}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lab_state, "DATA_DIR", str(tmp_path))
+    lab_state._invalidate_lab_dirs()
+    lab_state._used_subnets_indexed.cache_clear()
+    yield tmp_path
+    lab_state._invalidate_lab_dirs()
+    lab_state._used_subnets_indexed.cache_clear()
+
+
+def _parse_header(path):
+    st = os.stat(path)
+    return lab_state._parse_state_header(str(path), st.st_mtime_ns, st.st_size)
+
+
+def test_legacy_state_yml_is_migrated_on_next_write(data_dir):
+    legacy = {
+        "lab_id": "att-00000001",
+        "template": "attack",
+        "name": "Attack lab",
+        "status": "stopped",
+        "subnet": "172.30.1.0/24",
+        # Older files did not keep services last
+        "services": [{"name": "kali", "image": "kali:latest", "ip_offset": 10}],
+        "created_at": "2025-01-01T00:00:00+00:00",
+    }
+    lab_dir = data_dir / "att-00000001"
+    lab_dir.mkdir()
+    (lab_dir / "state.yml").write_text(yaml.safe_dump(legacy))
+
+    state = LabState("att-00000001")
+    assert state.load() == legacy
+
+    state.update_status("running")
+
+    assert not (lab_dir / "state.yml").exists()
+    migrated = json.loads((lab_dir / "state.json").read_text())
+    assert migrated["status"] == "running"
+    assert migrated["services"] == legacy["services"]
+    assert list(migrated)[-1] == "services"
+    assert LabState.list_all()[0]["status"] == "running"
+
+
+@pytest.mark.parametrize(
+    "description",
+    [
+        "plain",
+        "mentions services: inline",
+        'line one\n  "services": [] on a new line',
+        "",
+    ],
+)
+def test_header_parse_matches_emitted_state(data_dir, description):
+    state = LabState("att-00000002").create("attack", {**CONFIG, "description": description}, "172.30.2.0/24")
+    path = data_dir / "att-00000002" / "state.json"
+
+    assert json.loads(path.read_text()) == state
+    header = _parse_header(path)
+    assert header == {key: value for key, value in state.items() if key != "services"}
+
+
+def test_header_parse_of_legacy_yaml(data_dir):
+    path = data_dir / "state.yml"
+    path.write_text(
+        "lab_id: att-00000003\n"
+        "description: 'mentions services: inline'\n"
+        "services:\n"
+        "- name: kali\n"
+    )
+    assert _parse_header(path) == {"lab_id": "att-00000003", "description": "mentions services: inline"}
+
+
+def test_index_drops_removed_lab_dirs(data_dir):
+    for i, lab_id in enumerate(("att-0000000b", "att-0000000a", "att-0000000c"), start=1):
+        LabState(lab_id).create("attack", CONFIG, f"172.30.{i}.0/24")
+    assert [lab["lab_id"] for lab in LabState.list_all()] == ["att-0000000a", "att-0000000b", "att-0000000c"]
+
+    shutil.rmtree(data_dir / "att-0000000b")
+    lab_state._invalidate_lab_dirs()
+
+    assert [lab["lab_id"] for lab in LabState.list_all()] == ["att-0000000a", "att-0000000c"]
+    assert sorted(json.loads((data_dir / "index.json").read_text())) == ["att-0000000a", "att-0000000c"]
+    assert sorted(LabState.used_subnets()) == ["172.30.2.0/24", "172.30.3.0/24"]
+
+
+def test_index_repairs_entry_lost_to_concurrent_write(data_dir):
+    LabState("att-0000000d").create("attack", CONFIG, "172.30.4.0/24")
+    index_file = data_dir / "index.json"
+    stale_index = index_file.read_text()
+
+    LabState("att-0000000d").update_status("running")
+    # Another process rewrites the index from a copy read before our update
+    index_file.write_text(stale_index)
+
+    assert LabState.list_all()[0]["status"] == "running"
+    assert json.loads(index_file.read_text())["att-0000000d"]["summary"]["status"] == "running"
+
+
+def test_resolve_id_does_not_depend_on_index_key_order(data_dir):
+    for i, lab_id in enumerate(("att-0000000e", "mal-0000000f"), start=1):
+        LabState(lab_id).create("attack", CONFIG, f"172.30.{i}.0/24")
+    index_file = data_dir / "index.json"
+    index = json.loads(index_file.read_text())
+    index_file.write_text(json.dumps(dict(reversed(list(index.items())))))
+
+    assert LabState.resolve_id("att") == "att-0000000e"
+    assert LabState.resolve_id("mal") == "mal-0000000f"
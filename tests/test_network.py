@@ -0,0 +1,54 @@
+import pytest
+
+from labforge.network import NetworkAllocator, NetworkError
+
+
+def _subnets(*thirds):
+    return [f"172.30.{n}.0/24" for n in thirds]
+
+
+def test_allocates_from_first_subnet_when_empty():
+    allocator = NetworkAllocator()
+    assert allocator.allocate() == "172.30.1.0/24"
+    assert allocator.allocate() == "172.30.2.0/24"
+
+
+def test_resumes_after_highest_used_subnet():
+    # The gap at .2 is left alone until the scan wraps around
+    allocator = NetworkAllocator(_subnets(1, 3))
+    assert allocator.allocate() == "172.30.4.0/24"
+
+
+def test_skips_used_subnets_while_scanning():
+    allocator = NetworkAllocator(_subnets(1, 2, 3, 254))
+    assert allocator.allocate() == "172.30.255.0/24"
+    # Wraps to the start of the range and steps over the used subnets there
+    assert allocator.allocate() == "172.30.4.0/24"
+
+
+def test_wraps_around_to_first_subnet():
+    allocator = NetworkAllocator(_subnets(255))
+    assert allocator.allocate() == "172.30.1.0/24"
+
+
+def test_raises_when_range_is_exhausted():
+    allocator = NetworkAllocator(_subnets(*range(1, 256)))
+    with pytest.raises(NetworkError):
+        allocator.allocate()
+
+
+def test_never_allocates_base_subnet():
+    allocator = NetworkAllocator(_subnets(*range(1, 255)))
+    assert allocator.allocate() == "172.30.255.0/24"
+    with pytest.raises(NetworkError):
+        allocator.allocate()
+
+
+def test_ignores_subnets_outside_range_for_cursor():
+    allocator = NetworkAllocator(["10.0.5.0/24", "172.31.9.0/24", "not-a-subnet", *_subnets(3)])
+    assert allocator.allocate() == "172.30.4.0/24"
+
+
+def test_only_outside_subnets_start_at_first_subnet():
+    allocator = NetworkAllocator(["172.31.200.0/24", "192.168.1.0/24"])
+    assert allocator.allocate() == "172.30.1.0/24"
@@ -0,0 +1,15 @@
+from click.testing import CliRunner
+
+from labforge.commands.status import status
+
+
+def test_status_rejects_lab_id_with_all():
+    result = CliRunner().invoke(status, ["att-1234", "--all"])
+    assert result.exit_code == 2
+    assert "not both" in result.output
+
+
+def test_status_requires_lab_id_or_all():
+    result = CliRunner().invoke(status, [])
+    assert result.exit_code == 2
+    assert "LAB_ID" in result.output